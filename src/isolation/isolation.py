@@ -33,6 +33,29 @@ class Action(IntEnum):
 
 _ACTIONSET = set(Action)  # used for efficient membership testing
 
+# count the set bits of an integer (int.bit_count() requires python 3.10+)
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
+
+
+def _bits(x):
+    """ Yield the index of each set bit in `x` from least to most significant """
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+# Precompute the knight moves from every cell of the board. _MOVES[loc] holds
+# an (action, destination, destination bit) triple for each move that lands on
+# the board (in Action order), and _NEIGHBORS[loc] is the bitmask of all the
+# destinations; masking either one with a board gives the open cells
+_MOVES = tuple(
+    tuple((a, loc + a, 1 << (loc + a)) for a in Action
+          if loc + a >= 0 and _BLANK_BOARD & (1 << (loc + a)))
+    for loc in range(_SIZE)
+)
+_NEIGHBORS = tuple(sum(bit for _, _, bit in moves) for moves in _MOVES)
+
 
 class Isolation(NamedTuple('Isolation', [('board', int), ('ply_count', int), ('locs', int)])):
     """ Bitboard implementation of knight's Isolation game state
@@ -74,7 +97,8 @@ class Isolation(NamedTuple('Isolation', [('board', int), ('ply_count', int), ('l
         loc = self.locs[self.player()]
         if loc is None:
             return self.liberties(loc)
-        return [a for a in Action if (a + loc) >= 0 and (self.board & (1 << (a + loc)))]
+        board = self.board
+        return [a for a, _, bit in _MOVES[loc] if board & bit]
 
     def player(self):
         """ Return the id (zero for first player, one for second player) of player
@@ -165,17 +189,51 @@ class Isolation(NamedTuple('Isolation', [('board', int), ('ply_count', int), ('l
             A list containing the position of open liberties in the
             neighborhood of the starting position
         """
-        cells = range(_SIZE) if loc is None else (loc + a for a in Action)
-        return [c for c in cells if c >= 0 and self.board & (1 << c)]
+        if loc is None:
+            return list(_bits(self.board))
+        board = self.board
+        return [c for _, c, bit in _MOVES[loc] if board & bit]
+
+    def liberty_mask(self, loc):
+        """ Return a bitmask of the open cells in the neighborhood of `loc`
+
+        The mask has the same bits set as the cells returned by
+        `Isolation.liberties()`, but it is built with a single table
+        lookup and a bitwise AND.
+
+        Parameters
+        ----------
+        loc : int
+            A position on the current board to use as the anchor point for
+            available liberties (or None for a player that has not moved)
+
+        Returns
+        -------
+        int
+            A bitboard with ones for each open liberty of `loc`
+        """
+        if loc is None:
+            return self.board
+        return _NEIGHBORS[loc] & self.board
+
+    def mobility(self, loc):
+        """ Return the number of liberties in the neighborhood of `loc`
+
+        Equivalent to `len(self.liberties(loc))` without building the list.
+        """
+        return _popcount(self.liberty_mask(loc))
 
     def _has_liberties(self, player_id):
         """ Return True if the player has any legal moves in the given state
 
+        Matches `any(self.liberties(loc))`, where the cell index 0 is falsy,
+        so a lone liberty at cell 0 does not count.
+
         See Also
         -------
             Isolation.liberties()
         """
-        return any(self.liberties(self.locs[player_id]))
+        return bool(self.liberty_mask(self.locs[player_id]) >> 1)
 
 
 class DebugState(Isolation):
@@ -1,5 +1,7 @@
 
 from sample_players import DataPlayer
+from transposition import (TranspositionTable, zobrist_hash, update_hash,
+                           EXACT, LOWER, UPPER)
 
 DEBUG_MODE = False
 
@@ -64,6 +66,11 @@ class CustomPlayer(DataPlayer):
           else:
             self.queue.put(random.choice(state.actions()))
         else:
+          # the transposition table is carried forward to the next turn
+          # through the context, so later searches start with its entries
+          self.context = self.context if isinstance(self.context, dict) else {}
+          self.tt = self.context.setdefault("tt", TranspositionTable())
+          self.tt.new_search()
           depth_limit = 100
           for depth in range(1, depth_limit + 1):
             action = self.alpha_beta_search(state, depth)
@@ -83,28 +90,50 @@ class CustomPlayer(DataPlayer):
       beta = float("inf")
       best_score = float("-inf")
       best_move = None
-      for a in state.actions():
-        v = self.min_value(state.result(a), alpha, beta, depth - 1)
-#        print("a = " + str(a) + " | v = " + str(v))
+      key = zobrist_hash(state)
+      for a in self.ordered_actions(state, key):
+        v = self.min_value(state.result(a), alpha, beta, depth - 1, update_hash(key, state, a))
         alpha = max(alpha, v)
-        if v > best_score:
+        if v > best_score or best_move is None:
           best_score = v
           best_move = a
-#      if DEBUG_MODE:
-#        print("AB Search - best_score = " + str(best_score) + " | alpha = " + str(alpha) + " | beta = " + str(beta) + " | actions = " + str(state.actions()))
+      self.tt.store(key, depth, EXACT, best_score, best_move)
       return best_move
 
-    def min_value(self, state, alpha, beta, depth):
+    def ordered_actions(self, state, key):
+      """ Return the legal actions with the best move stored in the
+      transposition table for the state (if any) searched first
+      """
+      actions = state.actions()
+      entry = self.tt.probe(key)
+      if entry is not None and entry[3] in actions:
+        actions.insert(0, actions.pop(actions.index(entry[3])))
+      return actions
+
+    def probe(self, key, alpha, beta, depth):
+      """ Return a value from the transposition table if the stored search
+      was deep enough to decide the node within the (alpha, beta) window,
+      otherwise return None
+      """
+      entry = self.tt.probe(key)
+      if entry is None or entry[0] < depth:
+        return None
+      _, flag, value, _ = entry
+      if flag == EXACT:
+        return value
+      if flag == LOWER and value >= beta:
+        return value
+      if flag == UPPER and value <= alpha:
+        return value
+      return None
+
+    def min_value(self, state, alpha, beta, depth, key):
       """ Return the game state utility if the game is over,
       otherwise return the minimum value over all legal successors
       """
       if state.terminal_test():
-#        if DEBUG_MODE:
-#          print("min value - terminal node with value " + str(state.utility(self.player_id)))
         return state.utility(self.player_id)
       if depth <= 0:
-#        if DEBUG_MODE:
-#          print("min value - heuristic value " + str(self.baseline(state)))
         return self.baseline(state)
         #return self.weighted_attacking(state, 3)
         #return self.weighted_defensive(state, 3)
@@ -112,27 +141,29 @@ class CustomPlayer(DataPlayer):
         #return self.weighted_increasingly_defensive(state, 3)
         #return self.defensive_to_attacking(state, 3)
         #return self.attacking_to_defensive(state, 3)
+      v = self.probe(key, alpha, beta, depth)
+      if v is not None:
+        return v
+      alpha_orig, beta_orig = alpha, beta
       v = float("inf")
-      for a in state.actions():
-        v = min(v, self.max_value(state.result(a), alpha, beta, depth - 1))
-#        if DEBUG_MODE:
-#          print("min value - depth = " + str(depth) + " | a = " + str(a) + " | v = " + str(v) + " | alpha = " + str(alpha) + " | beta = " + str(beta) + " | actions = " + str(state.actions()))
+      best_move = None
+      for a in self.ordered_actions(state, key):
+        child_v = self.max_value(state.result(a), alpha, beta, depth - 1, update_hash(key, state, a))
+        if child_v < v or best_move is None:
+          v, best_move = child_v, a
         if v <= alpha:
-          return v
+          break
         beta = min(beta, v)
+      self.tt.store(key, depth, self.bound(v, alpha_orig, beta_orig), v, best_move)
       return v
 
-    def max_value(self, state, alpha, beta, depth):
+    def max_value(self, state, alpha, beta, depth, key):
       """ Return the game state utility if the game is over,
       otherwise return the maximum value over all legal successors
       """
       if state.terminal_test():
-#        if DEBUG_MODE:
-#          print("max value - terminal node with value " + str(state.utility(self.player_id)))
         return state.utility(self.player_id)
       if depth <= 0:
-#        if DEBUG_MODE:
-#          print("max value - heuristic value " + str(self.baseline(state)))
         return self.baseline(state)
         #return self.weighted_attacking(state, 3)
         #return self.weighted_defensive(state, 3)
@@ -140,23 +171,38 @@ class CustomPlayer(DataPlayer):
         #return self.weighted_increasingly_defensive(state, 3)
         #return self.defensive_to_attacking(state, 3)
         #return self.attacking_to_defensive(state, 3)
+      v = self.probe(key, alpha, beta, depth)
+      if v is not None:
+        return v
+      alpha_orig, beta_orig = alpha, beta
       v = float("-inf")
-      for a in state.actions():
-        v = max(v, self.min_value(state.result(a), alpha, beta, depth - 1))
-#        if DEBUG_MODE:
-#          print("max value - depth = " + str(depth) + " | a = " + str(a) + " | v = " + str(v) + " | alpha = " + str(alpha) + " | beta = " + str(beta) + " | actions = " + str(state.actions()))
+      best_move = None
+      for a in self.ordered_actions(state, key):
+        child_v = self.min_value(state.result(a), alpha, beta, depth - 1, update_hash(key, state, a))
+        if child_v > v or best_move is None:
+          v, best_move = child_v, a
         if v >= beta:
-          return v
+          break
         alpha = max(alpha, v)
+      self.tt.store(key, depth, self.bound(v, alpha_orig, beta_orig), v, best_move)
       return v
 
+    @staticmethod
+    def bound(v, alpha, beta):
+      """ Classify a fail-soft search value against the original window """
+      if v <= alpha:
+        return UPPER
+      if v >= beta:
+        return LOWER
+      return EXACT
+
     # #my_moves - #opponent_moves heuristic
     def baseline(self, state):
       own_loc = state.locs[self.player_id]
       opp_loc = state.locs[1 - self.player_id]
-      own_liberties = state.liberties(own_loc)
-      opp_liberties = state.liberties(opp_loc)
-      return len(own_liberties) - len(opp_liberties)
+      own_liberties = state.mobility(own_loc)
+      opp_liberties = state.mobility(opp_loc)
+      return own_liberties - opp_liberties
 
     # attacking heuristic
     # variation of the baseline heuristic
@@ -165,9 +211,9 @@ class CustomPlayer(DataPlayer):
     def weighted_attacking(self, state, weight):
       own_loc = state.locs[self.player_id]
       opp_loc = state.locs[1 - self.player_id]
-      own_liberties = state.liberties(own_loc)
-      opp_liberties = state.liberties(opp_loc)
-      return len(own_liberties) - weight * len(opp_liberties)
+      own_liberties = state.mobility(own_loc)
+      opp_liberties = state.mobility(opp_loc)
+      return own_liberties - weight * opp_liberties
 
     # defensive heuristic
     # variation of the baseline heuristic
@@ -176,9 +222,9 @@ class CustomPlayer(DataPlayer):
     def weighted_defensive(self, state, weight):
       own_loc = state.locs[self.player_id]
       opp_loc = state.locs[1 - self.player_id]
-      own_liberties = state.liberties(own_loc)
-      opp_liberties = state.liberties(opp_loc)
-      return weight * len(own_liberties) - len(opp_liberties)
+      own_liberties = state.mobility(own_loc)
+      opp_liberties = state.mobility(opp_loc)
+      return weight * own_liberties - opp_liberties
 
     # increase importance of moves as the game goes forward
     # increasingly attacking player
@@ -189,9 +235,9 @@ class CustomPlayer(DataPlayer):
       progress = state.ply_count / board_size
       own_loc = state.locs[self.player_id]
       opp_loc = state.locs[1 - self.player_id]
-      own_liberties = state.liberties(own_loc)
-      opp_liberties = state.liberties(opp_loc)
-      return len(own_liberties) - weight * len(opp_liberties) * progress
+      own_liberties = state.mobility(own_loc)
+      opp_liberties = state.mobility(opp_loc)
+      return own_liberties - weight * opp_liberties * progress
 
     # increase importance of moves as the game goes forward
     # increasingly defensive player
@@ -202,9 +248,9 @@ class CustomPlayer(DataPlayer):
       progress = state.ply_count / board_size
       own_loc = state.locs[self.player_id]
       opp_loc = state.locs[1 - self.player_id]
-      own_liberties = state.liberties(own_loc)
-      opp_liberties = state.liberties(opp_loc)
-      return weight * len(own_liberties) * progress - len(opp_liberties)
+      own_liberties = state.mobility(own_loc)
+      opp_liberties = state.mobility(opp_loc)
+      return weight * own_liberties * progress - opp_liberties
 
     # will prioritize playing defense on the first half of the game
     # and prioritize playing attack on the second half
@@ -54,8 +54,7 @@ class GreedyPlayer(BasePlayer):
     """
     def score(self, state):
         own_loc = state.locs[self.player_id]
-        own_liberties = state.liberties(own_loc)
-        return len(own_liberties)
+        return state.mobility(own_loc)
 
     def get_action(self, state):
         """Select the move from the available legal moves with the highest
@@ -130,6 +129,4 @@ class MinimaxPlayer(BasePlayer):
     def score(self, state):
         own_loc = state.locs[self.player_id]
         opp_loc = state.locs[1 - self.player_id]
-        own_liberties = state.liberties(own_loc)
-        opp_liberties = state.liberties(opp_loc)
-        return len(own_liberties) - len(opp_liberties)
+        return state.mobility(own_loc) - state.mobility(opp_loc)
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from isolation import Isolation
+from isolation.isolation import Action, _SIZE
+
+
+def reference_liberties(state, loc):
+    """ Move generation by walking the Action enum (the original implementation) """
+    cells = range(_SIZE) if loc is None else (loc + a for a in Action)
+    return [c for c in cells if c >= 0 and state.board & (1 << c)]
+
+
+def reference_actions(state):
+    loc = state.locs[state.player()]
+    if loc is None:
+        return reference_liberties(state, loc)
+    return [a for a in Action if (a + loc) >= 0 and (state.board & (1 << (a + loc)))]
+
+
+def random_states(num_games, seed=0):
+    """ Yield every state visited in a number of random games """
+    rng = random.Random(seed)
+    for _ in range(num_games):
+        state = Isolation()
+        yield state
+        while not state.terminal_test():
+            state = state.result(rng.choice(state.actions()))
+            yield state
+
+
+class MoveGenerationTest(unittest.TestCase):
+    def test_actions_match_reference(self):
+        """ actions() returns the same moves in the same order as the enum walk """
+        for state in random_states(20):
+            actions = state.actions()
+            self.assertEqual(actions, reference_actions(state))
+            self.assertEqual([type(a) for a in actions],
+                             [type(a) for a in reference_actions(state)])
+
+    def test_liberties_match_reference(self):
+        """ liberties(), liberty_mask() and mobility() agree with the enum walk """
+        for state in random_states(20, seed=1):
+            for loc in state.locs:
+                expected = reference_liberties(state, loc)
+                self.assertEqual(state.liberties(loc), expected)
+                self.assertEqual(state.mobility(loc), len(expected))
+                self.assertEqual(state.liberty_mask(loc), sum(1 << c for c in expected))
+
+    def test_terminal_test_matches_reference(self):
+        """ terminal_test() agrees with any() over the reference liberties """
+        for state in random_states(20, seed=2):
+            expected = not all(any(reference_liberties(state, loc)) for loc in state.locs)
+            self.assertEqual(state.terminal_test(), expected)
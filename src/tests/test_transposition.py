@@ -0,0 +1,46 @@
+import random
+import unittest
+
+from isolation import Isolation
+from transposition import (TranspositionTable, zobrist_hash, update_hash,
+                           EXACT, LOWER, ALWAYS_REPLACE)
+
+
+class ZobristHashTest(unittest.TestCase):
+    def test_incremental_update_matches_full_hash(self):
+        """ update_hash() agrees with hashing every child state from scratch """
+        rng = random.Random(0)
+        for _ in range(10):
+            state = Isolation()
+            key = zobrist_hash(state)
+            while not state.terminal_test():
+                for action in state.actions():
+                    self.assertEqual(update_hash(key, state, action),
+                                     zobrist_hash(state.result(action)))
+                action = rng.choice(state.actions())
+                key = update_hash(key, state, action)
+                state = state.result(action)
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def test_probe_returns_stored_entry(self):
+        tt = TranspositionTable(size=8)
+        tt.store(12345, 3, EXACT, -2.0, 25)
+        self.assertEqual(tt.probe(12345), (3, EXACT, -2.0, 25))
+        self.assertIsNone(tt.probe(12345 + 8))  # same slot, different key
+
+    def test_depth_preferred_keeps_deeper_entry(self):
+        tt = TranspositionTable(size=8)
+        tt.store(1, 5, EXACT, 1.0, 11)
+        tt.store(9, 2, LOWER, 4.0, -15)
+        self.assertEqual(tt.probe(1), (5, EXACT, 1.0, 11))
+        tt.new_search()  # entries from an earlier search can be replaced
+        tt.store(9, 2, LOWER, 4.0, -15)
+        self.assertEqual(tt.probe(9), (2, LOWER, 4.0, -15))
+
+    def test_always_replace_overwrites(self):
+        tt = TranspositionTable(size=8, policy=ALWAYS_REPLACE)
+        tt.store(1, 5, EXACT, 1.0, 11)
+        tt.store(9, 2, LOWER, float("inf"), None)
+        self.assertIsNone(tt.probe(1))
+        self.assertEqual(tt.probe(9), (2, LOWER, float("inf"), None))
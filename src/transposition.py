@@ -0,0 +1,117 @@
+import random
+
+from array import array
+
+from isolation.isolation import _BLANK_BOARD, _SIZE, _bits
+
+# Zobrist keys: one random 64-bit string per blocked cell, one per cell for
+# the location of each player, and one for the second player to move. The
+# hash of a state is the XOR of the keys for every feature present in it.
+# The generator is seeded so that every process agrees on the keys.
+_rng = random.Random(0x150)
+_BLOCKED_KEYS = tuple(_rng.getrandbits(64) for _ in range(_SIZE))
+_LOC_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(_SIZE)) for _ in range(2))
+_SIDE_KEY = _rng.getrandbits(64)
+
+# bound types stored with each table entry
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# replacement policies for colliding entries
+DEPTH_PREFERRED = "depth"
+ALWAYS_REPLACE = "always"
+
+DEFAULT_SIZE = 1 << 16
+NO_MOVE = -128
+
+
+def zobrist_hash(state):
+    """ Return the Zobrist hash of an Isolation state from scratch """
+    key = _SIDE_KEY if state.player() else 0
+    for cell in _bits(~state.board & _BLANK_BOARD):
+        key ^= _BLOCKED_KEYS[cell]
+    for player_id, loc in enumerate(state.locs):
+        if loc is not None:
+            key ^= _LOC_KEYS[player_id][loc]
+    return key
+
+
+def update_hash(key, state, action):
+    """ Return the Zobrist hash of state.result(action) given the hash of state
+
+    This only touches the keys for the cell that gets blocked, the old and new
+    location of the active player, and the side to move.
+    """
+    player_id = state.player()
+    loc = state.locs[player_id]
+    if loc is None:
+        dest = action
+    else:
+        dest = loc + action
+        key ^= _LOC_KEYS[player_id][loc]
+    return key ^ _BLOCKED_KEYS[dest] ^ _LOC_KEYS[player_id][dest] ^ _SIDE_KEY
+
+
+class TranspositionTable:
+    """ Fixed-size hash table of search results keyed by Zobrist hash
+
+    Each slot records the full key, search depth, bound type, value and best
+    move of one position. The slots are stored in parallel typed arrays rather
+    than a list of tuples so that the table pickles as a few flat buffers when
+    it is passed forward to the next turn through `self.context`.
+
+    Parameters
+    ----------
+    size : int
+        The maximum number of entries held in the table
+
+    policy : str
+        How to resolve two positions mapping to the same slot. With
+        DEPTH_PREFERRED, an entry from the current search is only replaced
+        by a search to at least the same depth; with ALWAYS_REPLACE the
+        newest entry always wins.
+    """
+    def __init__(self, size=DEFAULT_SIZE, policy=DEPTH_PREFERRED):
+        if policy not in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            raise ValueError("Unknown replacement policy: {}".format(policy))
+        self.size = size
+        self.policy = policy
+        self.generation = 0
+        self.keys = array('Q', bytes(8 * size))
+        self.depths = array('b', [-1]) * size
+        self.flags = array('b', bytes(size))
+        self.values = array('d', bytes(8 * size))
+        self.moves = array('b', [NO_MOVE]) * size
+        self.ages = array('H', bytes(2 * size))
+
+    def new_search(self):
+        """ Age the table so that entries from earlier turns can be replaced """
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def probe(self, key):
+        """ Return (depth, flag, value, move) for the key, or None on a miss
+
+        `move` is None if no best move was recorded for the position.
+        """
+        idx = key % self.size
+        if self.depths[idx] < 0 or self.keys[idx] != key:
+            return None
+        move = self.moves[idx]
+        return (self.depths[idx], self.flags[idx], self.values[idx],
+                None if move == NO_MOVE else move)
+
+    def store(self, key, depth, flag, value, move):
+        idx = key % self.size
+        if (self.policy == DEPTH_PREFERRED and self.depths[idx] > depth
+                and self.ages[idx] == self.generation):
+            return
+        if move is None and self.keys[idx] == key and self.depths[idx] >= 0:
+            move = self.moves[idx]  # keep the old best move for this position
+        self.keys[idx] = key
+        self.depths[idx] = min(depth, 127)
+        self.flags[idx] = flag
+        self.values[idx] = value
+        self.moves[idx] = NO_MOVE if move is None else move
+        self.ages[idx] = self.generation
+
+    def __len__(self):
+        return sum(1 for d in self.depths if d >= 0)